@@ -0,0 +1,99 @@
+'''Board geometry of the Senku and the bitboard tables built from it.'''
+
+from collections import namedtuple
+
+# Board geometry: the 33 cells of the english board (a cross),
+# inside a grid of BOARD_SIDE x BOARD_SIDE.
+BOARD_SIDE = 7
+CELLS = tuple([(x, y) for x in range(BOARD_SIDE) for y in range(BOARD_SIDE)
+               if 2 <= x <= 4 or 2 <= y <= 4])
+VALID_CELLS = frozenset(CELLS)
+
+# The board is a bitboard (an int): the cell (x, y) is the bit x*7+y.
+# VALID_MASK has the bits of the grid that are real cells set to 1.
+POS_TO_BIT = dict([(cell, cell[0] * BOARD_SIDE + cell[1]) for cell in CELLS])
+BIT_TO_POS = dict([(bit, cell) for cell, bit in POS_TO_BIT.items()])
+VALID_MASK = sum([1 << bit for bit in BIT_TO_POS])
+
+# The board at the start of a game: every cell filled except the center.
+INITIAL_BOARD = VALID_MASK & ~(1 << POS_TO_BIT[(3, 3)])
+
+def _jumps_from(orig):
+    '''Return the (mid, dest) cells of the jumps that start in orig.'''
+    
+    x, y = orig
+    return [((x + dx, y + dy), (x + 2 * dx, y + 2 * dy))
+            for dx, dy in ((-1, 0), (1, 0), (0, -1), (0, 1))
+            if (x + 2 * dx, y + 2 * dy) in POS_TO_BIT]
+
+# Every jump of the board (76 in total): JUMPS maps (orig, dest) positions
+# to the Jump with their bit indices, and MOVES just holds the Jumps.
+Jump = namedtuple('Jump', 'orig mid dest')
+JUMPS = dict([((orig, dest), Jump(POS_TO_BIT[orig], POS_TO_BIT[mid],
+                                  POS_TO_BIT[dest]))
+              for orig in CELLS for mid, dest in _jumps_from(orig)])
+MOVES = tuple(sorted(JUMPS.values()))
+
+# The same jumps as (mask, need) pairs: mask has the three involved bits on,
+# need only the orig and mid bits (the jump is legal iff board & mask == need).
+MOVE_MASKS = tuple([((1 << orig) | (1 << mid) | (1 << dest),
+                     (1 << orig) | (1 << mid))
+                    for orig, mid, dest in MOVES])
+
+# Cells with room in their row for a jump to the right (y + 2) and to the
+# left (y - 2). Shifting the board by 1 moves cells along a row, so these
+# keep jumps from wrapping to the next row.
+RIGHT_JUMP_MASK = sum([1 << POS_TO_BIT[cell] for cell in CELLS
+                       if cell[1] < BOARD_SIDE - 2])
+LEFT_JUMP_MASK = sum([1 << POS_TO_BIT[cell] for cell in CELLS if cell[1] >= 2])
+
+def end_cells(board):
+    '''Return the number of filled cells if there's no possible
+    movement in the board (a bitboard) given, or -1 otherwise.
+    
+    The four directions are tested at once for the whole board: a cell is
+    an origin if it's filled, the next one is filled and the one after is
+    empty (shifting by 1 moves along a row, by BOARD_SIDE along a column).'''
+    
+    empty = VALID_MASK & ~board
+    row = BOARD_SIDE
+    if (board & (board >> 1) & (empty >> 2) & RIGHT_JUMP_MASK)          \
+    or (board & (board << 1) & (empty << 2) & LEFT_JUMP_MASK)           \
+    or (board & (board >> row) & (empty >> 2 * row))                    \
+    or (board & (board << row) & (empty << 2 * row)):
+        return -1                           # movement
+    return bin(board).count('1')
+
+def _symmetric(cell, turns, flip):
+    '''Return the cell where a symmetry of the board moves the cell
+    given: rotate it 90 degrees turns times, then flip it if asked.'''
+    
+    x, y = cell
+    for _ in range(turns):
+        x, y = y, BOARD_SIDE - 1 - x
+    if flip:
+        y = BOARD_SIDE - 1 - y
+    return (x, y)
+
+# The 8 symmetries of the board (rotations and reflections), each one as
+# a list that gives the bit where every bit of the board goes.
+SYMMETRIES = tuple([[POS_TO_BIT[_symmetric(BIT_TO_POS[bit], turns, flip)]
+                     if bit in BIT_TO_POS else None
+                     for bit in range(BOARD_SIDE * BOARD_SIDE)]
+                    for flip in (False, True) for turns in range(4)])
+
+def canonical(board):
+    '''Return the smallest of the 8 boards symmetric to the board given
+    (a bitboard), so equivalent positions share the same value.'''
+    
+    best = board
+    for perm in SYMMETRIES:
+        image = 0
+        pegs = board
+        while pegs:
+            bit = pegs & -pegs
+            pegs ^= bit
+            image |= 1 << perm[bit.bit_length() - 1]
+        if image < best:
+            best = image
+    return best
@@ -6,6 +6,10 @@ Last Update on 2009.01.24
 
 from pysenku.util.stack         import DynamicBoundedStack
 from pysenku.util.observer      import Subject
+from pysenku.model.move         import Move
+from pysenku.model.solver       import Solver
+from pysenku.model.board        import INITIAL_BOARD, POS_TO_BIT, \
+    BIT_TO_POS, JUMPS, end_cells, canonical
 
 # Max movements that you can undo.
 # for infinite undo, just put a value > 32, because
@@ -16,34 +20,28 @@ MAX_UNDO_ACTIONS = 5
 # True to enable, False to disable
 DEFAULT_GAME_TRACKING = True
 
-#auxiliary function
-def avg(a, b):
-    '''Return a new tuple with average 
-    of elements from a and b.'''
-    
-    res = []
-    for i in range(len(a)):
-        res.append((a[i] + b[i]) / 2)
-    return tuple(res)
-
 class SenkuGame(Subject):
     '''
     Implements all the Senku game logic.
     
-    @ivar _board: Dictionary with the game board.
+    @ivar _board: Bitboard with the game board (bit on = cell filled).
     @ivar _undo_stack: Stack of undo commands (movements).
+    @ivar _solver: Solver used to give hints.
     
     @note: This class use Subject as an interface (to notify changes).
     '''
     
+    __slots__ = ('_board', '_undo_stack', '_with_tracking', '_solver')
+    
     def __init__(self):
         '''Constructor of SenkuGame.'''
         
         Subject.__init__(self)
-        self._board = {}
+        self._board = 0
         self.__fill_board()
         self._undo_stack = DynamicBoundedStack(MAX_UNDO_ACTIONS)
         self._with_tracking = DEFAULT_GAME_TRACKING
+        self._solver = Solver()
     
     
     def get_board(self):
@@ -65,30 +63,29 @@ class SenkuGame(Subject):
     
     
     def __fill_board(self):
-        '''Fill the entire board with True's except the center.'''
-        
-        for x in (0, 1, 5, 6):
-            for y in (2, 3, 4):
-                self.fill_cell((x, y))
+        '''Fill the entire board except the center, without notifying
+        each cell (observers get the whole board with BOARD_STATE).'''
         
-        for x in (2, 3, 4):
-            for y in range(7):
-                self.fill_cell((x, y))
+        self._board = INITIAL_BOARD
+    
+    
+    def is_filled(self, cell):
+        '''Checks if the cell specified is filled.'''
         
-        self.empty_cell((3, 3))         # the center
+        return (self._board >> POS_TO_BIT[cell]) & 1
     
     
     def fill_cell(self, cell):
         '''Mark a cell specified as fill.'''
         
-        self.get_board()[cell] = True
+        self._board |= 1 << POS_TO_BIT[cell]
         self.notify('CELL_ON', cell)
     
     
     def empty_cell(self, cell):
         '''Mark a cell specified as empty.'''
         
-        self.get_board()[cell] = False
+        self._board &= ~(1 << POS_TO_BIT[cell])
         self.notify('CELL_OFF', cell)
     
     
@@ -96,10 +93,7 @@ class SenkuGame(Subject):
         '''Checks if the distance between the two points received
         is appropiate for a movement in the game.'''
         
-        return                                                      \
-            (abs(orig[0] - dest[0]) == 2 and orig[1] == dest[1])    \
-                or                                                  \
-            (abs(orig[1] - dest[1]) == 2 and orig[0] == dest[0])
+        return (orig, dest) in JUMPS
     
     
     def check_cells(self, orig, dest):
@@ -110,16 +104,38 @@ class SenkuGame(Subject):
             +. the cell between orig and dest is fill
         '''
         
-        return self.get_board()[orig] and not self.get_board()[dest] \
-            and self.get_board()[avg(orig, dest)]
+        board = self._board
+        orig, mid, dest = JUMPS[(orig, dest)]
+        return (board >> orig) & 1 and not (board >> dest) & 1 \
+            and (board >> mid) & 1
+    
+    
+    def jump(self, orig, dest):
+        '''Flip the three cells of the jump from orig to dest, and notify
+        the bits flipped (BOARD_DELTA). Doing it twice leaves the board
+        as it was, so it also undoes the jump.'''
+        
+        jump = JUMPS[(orig, dest)]
+        delta = (1 << jump.orig) | (1 << jump.mid) | (1 << jump.dest)
+        self._board ^= delta
+        self.notify('BOARD_DELTA', delta)
+    
+    
+    def try_move(self, orig, dest):
+        '''Make the movement from orig to dest, if it's possible.'''
+        
+        jump = JUMPS.get((orig, dest))
+        if jump is not None:
+            Move(self, orig, dest, BIT_TO_POS[jump.mid]).execute()
     
     
     def movement_done(self, command):
         '''A movement command was executed, then the game push
         this command, notify changes and control the end.'''
         
-        self.get_undo_stack().push(command)
-        self.notify('UNDO_STACK', self.get_undo_stack())
+        undo_stack = self._undo_stack
+        undo_stack.push(command)
+        self.notify('UNDO_STACK', undo_stack)
         if self._with_tracking:
             self.check_end()
     
@@ -127,39 +143,54 @@ class SenkuGame(Subject):
     def undo(self):
         '''Undo the last action, if it's possible.'''
         
-        self.get_undo_stack().pop().undo()
-        self.notify('UNDO_STACK', self.get_undo_stack())
+        undo_stack = self._undo_stack
+        undo_stack.pop().undo()
+        self.notify('UNDO_STACK', undo_stack)
+    
+    
+    def get_canonical_board(self):
+        '''Return the board in its canonical form (the same for
+        all the positions equivalent by symmetry).'''
+        
+        return canonical(self._board)
+    
+    
+    def hint(self, board=None, stop=None):
+        '''Return a movement (orig, dest) that leads to a single cell
+        filled, or None if there's no way to get it from the board
+        given (a bitboard, by default the current one) or if a single
+        cell is already filled. Raise SearchAborted if the solver gives
+        up first, or if stop (a function without arguments) returns
+        true while it searches.'''
+        
+        if board is None:
+            board = self._board
+        line = self._solver.solve(board, stop)
+        if line:
+            return (BIT_TO_POS[line[0].orig], BIT_TO_POS[line[0].dest])
+        return None
     
     
     def check_end(self):
         '''Check if there's no possible movements, then notify
         if the game is over.'''
         
-        cells_left = 0
-        for pos1, cell in self.get_board().items():
-            if cell:
-                for pos2 in self.get_board():
-                    if self.check_distance(pos1, pos2) \
-                    and self.check_cells(pos1, pos2):
-                        return None         # movement
-                cells_left += 1
-        self.notify('GAME_OVER', cells_left)
+        cells_left = end_cells(self._board)
+        if cells_left >= 0:
+            self.notify('GAME_OVER', cells_left)
     
     
     def get_all_changes(self):
         '''Force to trigger all the model changes to update its observers.'''
 
-        self.notify('UNDO_STACK', self.get_undo_stack())
-        for k in self.get_board():
-            if self.get_board()[k]:
-                self.notify('CELL_ON', k)
-            else:
-                self.notify('CELL_OFF', k)
+        self.notify('UNDO_STACK', self._undo_stack)
+        self.notify('BOARD_STATE', self._board)
     
     
     def restart(self):
         '''Reset the game (starting a new game too).'''
         
         self.__fill_board()
-        self.get_undo_stack().make_empty()
-        self.notify('UNDO_STACK', self.get_undo_stack())
+        self.notify('BOARD_STATE', self._board)
+        self._undo_stack.make_empty()
+        self.notify('UNDO_STACK', self._undo_stack)
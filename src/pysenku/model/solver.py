@@ -0,0 +1,104 @@
+'''Solver of Senku boards, used by the game to give hints.'''
+
+from pysenku.model.board import MOVES, MOVE_MASKS, BIT_TO_POS
+
+# Max boards searched by each solve before giving up (some seconds). It
+# also bounds the boards remembered as lost, which are forgotten when the
+# solve ends.
+MAX_SEARCH_NODES = 2 ** 20
+
+# Boards searched between each call to the stop function of a solve.
+STOP_CHECK_NODES = 2 ** 10
+
+def _center_distance(bit):
+    '''Return the distance from the cell of the bit given to the center.'''
+    
+    x, y = BIT_TO_POS[bit]
+    return abs(x - 3) + abs(y - 3)
+
+# Every jump with its (mask, need) pair, to test and apply it in one step.
+# They're tried in this order: jumps from the outer cells first, since
+# pegs left far from the center are the ones that end up stranded.
+_JUMPS = tuple([(jump, mask, need)
+                for jump, (mask, need) in sorted(zip(MOVES, MOVE_MASKS),
+                    key=lambda each: -_center_distance(each[0].orig))])
+
+class SearchAborted(Exception):
+    '''The search was stopped before finding out if a single cell can
+    be left from the board.'''
+
+
+class Solver(object):
+    '''
+    Searches the movements that leave a single cell filled, with a depth
+    first search that remembers the boards already known as lost (a
+    transposition table, since many move orders reach the same board).
+    
+    @ivar _lost: Set of boards from where a single cell can't be left
+        (only kept while a solve runs).
+    @ivar _nodes: Boards searched by the solve running.
+    @ivar _stop: Function that tells the solve running to give up, or None.
+    '''
+    
+    __slots__ = ('_lost', '_nodes', '_stop')
+    
+    def __init__(self):
+        '''Constructor of Solver.'''
+        
+        self._lost = set()
+        self._nodes = 0
+        self._stop = None
+    
+    
+    def solvable(self, board, stop=None):
+        '''Checks if a single cell can be left from the board given.'''
+        
+        return self.solve(board, stop) is not None
+    
+    
+    def solve(self, board, stop=None):
+        '''Return the list of Jumps that leaves a single cell filled
+        from the board given, or None if there's no such list. Raise
+        SearchAborted if MAX_SEARCH_NODES boards are searched, or if
+        stop (a function without arguments) returns true, before
+        knowing it.'''
+        
+        line = []
+        self._nodes = 0
+        self._stop = stop
+        try:
+            found = self.__search(board, line)
+        finally:
+            self._lost.clear()
+            self._stop = None
+        if found:
+            line.reverse()
+            return line
+        return None
+    
+    
+    def __must_give_up(self):
+        '''Checks if the solve running has to give up (too many boards
+        searched, or its stop function says so).'''
+        
+        return self._nodes >= MAX_SEARCH_NODES or \
+            (self._stop is not None and self._stop())
+    
+    
+    def __search(self, board, line):
+        '''Search a winning line from the board, appending its jumps
+        to line (the last one first) if it's found.'''
+        
+        if not board & (board - 1):         # a single cell filled
+            return True
+        if board in self._lost:
+            return False
+        self._nodes += 1
+        if not self._nodes % STOP_CHECK_NODES and self.__must_give_up():
+            raise SearchAborted()
+        for jump, mask, need in _JUMPS:
+            if board & mask == need and self.__search(board ^ mask, line):
+                line.append(jump)
+                return True
+        self._lost.add(board)
+        return False
@@ -11,8 +11,17 @@ except ImportError:                     #python2
     from Tkinter import Tk, Canvas, Button, Frame, DISABLED, NORMAL
     from tkMessageBox import askyesno, showinfo
 
+try:                                    #python3
+    from queue import Queue, Empty
+except ImportError:                     #python2
+    from Queue import Queue, Empty
+
+from threading import Thread
+
 from pysenku.util.observer import Observer
-from pysenku.model.move import Move
+from pysenku.model.solver import SearchAborted
+from pysenku.model.board import CELLS, VALID_CELLS, POS_TO_BIT, \
+    BIT_TO_POS
 
 VERSION = 0.2
 BOARD_RECTANGLE_SIZE = 40
@@ -23,6 +32,11 @@ DIST = BOARD_RECTANGLE_SIZE - DIAMETER
 BOARD_BG_COLOR = '#00B000'      #dark green
 # selection color
 BOARD_SEL_COLOR = 'green'
+# hint color
+BOARD_HINT_COLOR = 'yellow'
+
+# Milliseconds between each check for the result of a hint search.
+HINT_POLL_TIME = 100
 
 CELL_EMPTY_COLOR = 'black'
 CELL_NOT_EMPTY_COLOR = 'red'
@@ -53,6 +67,8 @@ class UISenku(Observer):
     @ivar _game: the game logic (the model).
     @ivar _root: the main window.
     '''
+    
+    __slots__ = ('_game', '_root')
 
     def __init__(self, game):
         '''Constructor of UISenku. Build the main window and the
@@ -68,7 +84,7 @@ class UISenku(Observer):
         
         main_frame = Frame(self._root, width=280, height=330, bd=1)
         main_frame.pack()
-        BoardArea(self._game, main_frame)
+        board_area = BoardArea(self._game, main_frame)
         start_button = Button(main_frame)
         start_button.config(text='Nuevo', command=self.start)
         start_button.grid(row=1, column=0)
@@ -76,6 +92,7 @@ class UISenku(Observer):
         help_button.config(text='Mas info...', command=self.open_help)
         help_button.grid(row=1, column=2)
         UndoButton(self._game, main_frame)
+        HintButton(self._game, main_frame, board_area)
                     
     
     def open_ui(self):
@@ -117,11 +134,17 @@ class BoardArea(Observer):
     '''
     Represent the area in which the player will play.
     
-    @ivar _regions: Dictionary <game cell, screen rectangle>
+    @ivar _ovals: Dictionary <game cell, canvas oval item>
+    @ivar _rects: Dictionary <game cell, canvas selection rectangle item>
     @ivar _selection: the current cell selected to move.
         If there's no selection, the value is None.
+    @ivar _shown: bitboard with the cells drawn as filled.
+    @ivar _hint: the movement (orig, dest) shown as a hint, or None.
     '''
     
+    __slots__ = ('_game', '_canvas', '_selection', '_ovals', '_rects',
+                 '_shown', '_hint')
+    
     def __init__(self, game, parent):
         '''Initialize the canvas, the observers and the mouse bindings.'''
         
@@ -129,12 +152,40 @@ class BoardArea(Observer):
         self._game = game
         self._game.add_observer(self, 'CELL_OFF')
         self._game.add_observer(self, 'CELL_ON')
+        self._game.add_observer(self, 'BOARD_STATE')
+        self._game.add_observer(self, 'BOARD_DELTA')
         
         self._canvas = Canvas(parent, bg=BOARD_BG_COLOR, width=280, height=280)
-        self._canvas.grid(row=0, columnspan=3)
+        self._canvas.grid(row=0, columnspan=4)
         self._canvas.bind("<Button-1>", self.left_button_pressed)
         
         self._selection = None
+        self._ovals = {}
+        self._rects = {}
+        self._shown = 0
+        self._hint = None
+        self.__init_regions()
+    
+    
+    def __init_regions(self):
+        '''Create the oval (drawn as empty) and the selection rectangle
+        (hidden) of each cell, to be recolored later instead of drawing
+        new ones.'''
+        
+        for pos in CELLS:
+            origin_x = pos[1] * BOARD_RECTANGLE_SIZE
+            origin_y = pos[0] * BOARD_RECTANGLE_SIZE
+            corner_x = origin_x + BOARD_RECTANGLE_SIZE
+            corner_y = origin_y + BOARD_RECTANGLE_SIZE
+            self._rects[pos] = self._canvas.create_rectangle(origin_x, \
+                origin_y, corner_x, corner_y, outline=BOARD_BG_COLOR)
+            
+            origin_x = pos[1] * BOARD_RECTANGLE_SIZE + DIST
+            origin_y = pos[0] * BOARD_RECTANGLE_SIZE + DIST
+            corner_x = origin_x + BOARD_RECTANGLE_SIZE - DIST * 2
+            corner_y = origin_y + BOARD_RECTANGLE_SIZE - DIST * 2
+            self._ovals[pos] = self._canvas.create_oval(origin_x, origin_y, \
+                corner_x, corner_y, fill=CELL_EMPTY_COLOR)
     
     
     def get_selection(self):
@@ -157,14 +208,14 @@ class BoardArea(Observer):
         
         pos = self.get_position_from_pixels(event.x, event.y)
         if pos is not None:
-            if self.get_selection() is None:
-                self.set_selection(pos)
+            selection = self._selection
+            if selection is None:
+                self._selection = pos
                 self.make_selection(pos)
             else:
-                move_command = Move(self._game, self.get_selection(), pos)
-                move_command.execute()
-                self.clear_selection(self.get_selection())
-                self.set_selection(None)
+                self._game.try_move(selection, pos)
+                self.clear_selection(selection)
+                self._selection = None
 
     
     def make_selection(self, pos):
@@ -174,59 +225,118 @@ class BoardArea(Observer):
     
     
     def clear_selection(self, pos):
-        '''No longer selection in the position given.'''
+        '''No longer selection in the position given (it stays
+        marked if it's a cell of the hint shown).'''
+        
+        if self._hint is not None and pos in self._hint:
+            self.draw_sel_rect_from_pos(pos, BOARD_HINT_COLOR)
+        else:
+            self.draw_sel_rect_from_pos(pos, BOARD_BG_COLOR)
+    
+    
+    def show_hint(self, orig, dest):
+        '''Mark the cells of the movement given as a hint.'''
         
-        self.draw_sel_rect_from_pos(pos, BOARD_BG_COLOR)
+        self.clear_hint()
+        self._hint = (orig, dest)
+        self.draw_sel_rect_from_pos(orig, BOARD_HINT_COLOR)
+        self.draw_sel_rect_from_pos(dest, BOARD_HINT_COLOR)
+    
+    
+    def clear_hint(self):
+        '''Unmark the cells of the hint shown, if there's one.'''
+        
+        hint = self._hint
+        if hint is not None:
+            self._hint = None
+            for pos in hint:
+                if pos == self._selection:
+                    self.make_selection(pos)
+                else:
+                    self.clear_selection(pos)
     
         
     def draw_sel_rect_from_pos(self, pos, color):
         '''Draw the selection rectangle.'''
         
-        origin_x = pos[1] * BOARD_RECTANGLE_SIZE
-        origin_y = pos[0] * BOARD_RECTANGLE_SIZE
-        corner_x = origin_x + BOARD_RECTANGLE_SIZE
-        corner_y = origin_y + BOARD_RECTANGLE_SIZE
-        
-        self._canvas.create_rectangle(origin_x, origin_y, \
-                                      corner_x, corner_y, outline=color)
+        self._canvas.itemconfig(self._rects[pos], outline=color)
     
     
     def update(self, aspect, value):
-        '''The board organisation in the model has changed.'''
+        '''The board organisation in the model has changed (the
+        method that handles each aspect is taken from _HANDLERS).'''
+        
+        self.clear_hint()
+        self._HANDLERS[aspect](self, value)
+    
+    
+    def draw_filled_cell(self, pos):
+        '''Draw the cell given as filled.'''
+        
+        self.draw_circle_from_pos(pos, CELL_NOT_EMPTY_COLOR)
+        self._shown |= 1 << POS_TO_BIT[pos]
+    
+    
+    def draw_empty_cell(self, pos):
+        '''Draw the cell given as empty.'''
+        
+        self.draw_circle_from_pos(pos, CELL_EMPTY_COLOR)
+        self._shown &= ~(1 << POS_TO_BIT[pos])
+    
+    
+    def draw_board_delta(self, delta):
+        '''Draw the board after toggling the cells of the delta
+        given (a bitboard).'''
+        
+        self.draw_board(self._shown ^ delta)
+    
+    
+    def draw_board(self, board):
+        '''Draw the board given (a bitboard), redrawing only the
+        cells that changed since the last time.'''
         
-        if aspect == 'CELL_ON':
-            self.draw_circle_from_pos(value, CELL_NOT_EMPTY_COLOR)
-        elif aspect == 'CELL_OFF':
-            self.draw_circle_from_pos(value, CELL_EMPTY_COLOR)
+        changed = board ^ self._shown
+        self._shown = board
+        while changed:
+            bit = changed & -changed
+            changed ^= bit
+            if board & bit:
+                color = CELL_NOT_EMPTY_COLOR
+            else:
+                color = CELL_EMPTY_COLOR
+            self.draw_circle_from_pos(BIT_TO_POS[bit.bit_length() - 1], color)
     
     
     def draw_circle_from_pos(self, pos, color):
         '''Draw a cell empty or not empty.'''
         
-        origin_x = pos[1] * BOARD_RECTANGLE_SIZE + DIST
-        origin_y = pos[0] * BOARD_RECTANGLE_SIZE + DIST
-        corner_x = origin_x + BOARD_RECTANGLE_SIZE - DIST * 2
-        corner_y = origin_y + BOARD_RECTANGLE_SIZE - DIST * 2
-    
-        self._canvas.create_oval(origin_x, origin_y, \
-                                 corner_x, corner_y, fill=color)
+        self._canvas.itemconfig(self._ovals[pos], fill=color)
     
     
     def get_position_from_pixels(self, x_coord, y_coord):
         '''Get the board position corresponding with the
         coordinates given.'''
         
-        pos_y = int(x_coord / BOARD_RECTANGLE_SIZE)
-        pos_x = int(y_coord / BOARD_RECTANGLE_SIZE)
-        if (pos_x, pos_y) in self._game.get_board():
-            return (pos_x, pos_y)
+        pos = (y_coord // BOARD_RECTANGLE_SIZE, x_coord // BOARD_RECTANGLE_SIZE)
+        if pos in VALID_CELLS:
+            return pos
         else:
             return None
+    
+    # <aspect, method that draws its changes>, for update.
+    _HANDLERS = {'CELL_ON': draw_filled_cell, 'CELL_OFF': draw_empty_cell,
+                 'BOARD_STATE': draw_board, 'BOARD_DELTA': draw_board_delta}
 
 
 
 class UndoButton(Observer):
-    '''Represent the 'undo' button in the Senku GUI.'''
+    '''
+    Represent the 'undo' button in the Senku GUI.
+    
+    @ivar _state: the state the button has now (NORMAL or DISABLED).
+    '''
+    
+    __slots__ = ('_game', '_button', '_state')
     
     def __init__(self, game, parent):
         '''Constructor of UndoButton. Receive the game and the
@@ -237,19 +347,94 @@ class UndoButton(Observer):
         self._game.add_observer(self, 'UNDO_STACK')
         self._button = Button(parent, text='Deshacer', command=self.undo)
         self._button.grid(row=1, column=1)
+        self._state = NORMAL
     
     
     def update(self, aspect, value):
         '''The aspect is always UNDO_STACK. If there's no undo
-        actions, the button will be disabled.'''
+        actions, the button will be disabled (the button is only
+        configured when its state changes).'''
         
         if value.is_empty():
-            self._button.config(state=DISABLED)
+            state = DISABLED
         else:
-            self._button.config(state=NORMAL)
+            state = NORMAL
+        if state != self._state:
+            self._button.config(state=state)
+            self._state = state
     
     
     def undo(self):
         '''Tell the model to perform the undo action, if it's possible.'''
 
-        self._game.undo()
\ No newline at end of file
+        self._game.undo()
+    
+    
+class HintButton(object):
+    '''
+    Represent the 'hint' button in the Senku GUI. The solver runs in
+    another thread, so the window keeps responding while it searches
+    (and the search stops if the player moves meanwhile).
+    
+    @ivar _board_area: the area where the hint is shown.
+    @ivar _results: Queue where the search thread puts its result.
+    '''
+    
+    __slots__ = ('_game', '_board_area', '_button', '_results')
+    
+    def __init__(self, game, parent, board_area):
+        '''Constructor of HintButton. Receive the game, the parent
+        widget and the board area.'''
+        
+        self._game = game
+        self._board_area = board_area
+        self._results = Queue()
+        self._button = Button(parent, text='Pista', command=self.hint)
+        self._button.grid(row=1, column=3)
+    
+    
+    def hint(self):
+        '''Start to search a hint for the current board.'''
+        
+        self._button.config(state=DISABLED)
+        worker = Thread(target=self.search, args=(self._game.get_board(),))
+        worker.daemon = True
+        worker.start()
+        self._button.after(HINT_POLL_TIME, self.show_hint)
+    
+    
+    def search(self, board):
+        '''Search a hint for the board given (runs in the worker thread,
+        so it must not touch any widget). The search is abandoned as
+        soon as the board changes.'''
+        
+        game = self._game
+        try:
+            movement = game.hint(board, lambda: game.get_board() != board)
+        except SearchAborted:
+            movement = SearchAborted        # no answer, it gave up
+        self._results.put((board, movement))
+    
+    
+    def show_hint(self):
+        '''Show the hint found, or wait for it if the search
+        hasn't finished yet.'''
+        
+        try:
+            board, movement = self._results.get_nowait()
+        except Empty:
+            self._button.after(HINT_POLL_TIME, self.show_hint)
+            return
+        self._button.config(state=NORMAL)
+        if board != self._game.get_board():     # the player moved meanwhile
+            return
+        if movement is SearchAborted:
+            showinfo('Pista', 'No se encontro una pista a tiempo\n' + \
+                'desde esta posicion.')
+        elif movement is None and not board & (board - 1):
+            showinfo('Pista', 'Ya queda una sola ficha.')
+        elif movement is None:
+            showinfo('Pista', 'No es posible dejar una sola ficha\n' + \
+                'desde esta posicion.')
+        else:
+            self._board_area.show_hint(*movement)
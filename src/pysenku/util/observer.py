@@ -4,20 +4,31 @@ Last Update on 2009.01.24
 @author: Nahuel
 '''
 
+from collections import defaultdict
+from functools import partial
+
 class Subject(object):
     '''
     Interface to the observer pattern. All objects that notify
     changes must implement this interface.
     
-    @ivar observers: Dictionary of <aspect, list of observers>
-        for the object.
+    @ivar observers: Dictionary of <aspect, list of observers' update
+        methods> for the object (the bound methods are kept, to avoid
+        looking them up on each notification). Each list also has the
+        observers of all the aspects (a new aspect starts with a copy
+        of them).
+    @ivar _all_observers: List of the update methods of the observers
+        of all the aspects.
     '''
     
+    __slots__ = ('observers', '_all_observers')
+    
     def __init__(self):
-        '''Initialize the observers' dictionary, with the
-        special aspect "all".'''
+        '''Initialize the observers' dictionary and the list
+        of observers for all the aspects.'''
 
-        self.observers = {'all':[]}
+        self._all_observers = []
+        self.observers = defaultdict(partial(list, self._all_observers))
 
     
     def add_observer(self, obj, aspect=None):
@@ -26,42 +37,33 @@ class Subject(object):
         for all the subject's aspects.'''
         
         
+        update = obj.update
         if aspect is None:
-            self.observers['all'].append(obj)
+            self._all_observers.append(update)
+            for observers in self.observers.values():
+                observers.append(update)
         else:
-            if aspect not in self.observers:              
-                self.add_aspect(aspect)
-            self.observers[aspect].append(obj)
+            self.observers[aspect].append(update)
     
     
     def remove_observer(self, obj, aspect=None):
         '''Remove an observer for an aspect.'''
         
+        update = obj.update         # equal to the one added
         if aspect is None:
-            self.observers['all'].remove(obj)
+            self._all_observers.remove(update)
+            for observers in self.observers.values():
+                observers.remove(update)
         else:
-            self.observers[aspect].remove(obj)
+            self.observers[aspect].remove(update)
     
 
     def notify(self, aspect, value):
-        '''Notify changes for an aspect.'''
-        
-        try:
-            for observer in self.observers[aspect]:
-                observer.update(aspect, value)
-        except KeyError:
-            self.add_aspect(aspect)
-            for observer in self.observers[aspect]:
-                observer.update(aspect, value)
-        # also notify observers interested in 'all' aspects
-        for observer in self.observers['all']:
-            observer.update(aspect, value)
-    
-    
-    def add_aspect(self, aspect):
-        '''Add the entry for an aspect (with an empty list).'''
+        '''Notify changes for an aspect (observers interested
+        in all the aspects are notified too).'''
         
-        self.observers[aspect] = []
+        for update in self.observers.get(aspect, self._all_observers):
+            update(aspect, value)
 
 
 
@@ -69,7 +71,10 @@ class Observer(object):
     '''Interface to the observer pattern. Represent 
     observers of subject's aspects.'''
     
+    __slots__ = ()
+    
     def update(self, aspect, value):
         '''The observers must override this method.'''
         
-        pass
+        raise NotImplementedError('%s must override update' % \
+            type(self).__name__)
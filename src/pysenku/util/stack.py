@@ -4,25 +4,29 @@ Last Update on 2009.01.24
 @author: Nahuel
 '''
 
+from collections import deque
+from itertools import islice
+
 class DynamicBoundedStack(object):
     '''
     Stack with keep a maximum of elements.
     
-    @ivar _data: The internal storage (list).
-    @ivar _size: maximum of elements
+    @ivar _data: The internal storage (a deque bounded to the maximum
+        of elements, so it drops the oldest element by itself).
     '''
     
+    __slots__ = ('_data',)
+    
     def __init__(self, size):
         '''Constructor of DynamicBoundedStack.'''
         
-        self._data = []
-        self._size = size
+        self._data = deque(maxlen=size)
 
     
     def is_full(self):
         '''Check if the stack is full (reached the max size).'''
         
-        return len(self._data) == self._size
+        return len(self._data) == self._data.maxlen
     
     
     def is_empty(self):
@@ -34,20 +38,24 @@ class DynamicBoundedStack(object):
     def make_empty(self):
         '''Remove all elements in the stack.'''
         
-        self._data = []
+        self._data.clear()
     
     
     def push(self, elem):
         '''Always put the element, but if the stack reach
         the limit, removes the oldest element.'''
         
-        if self.is_full():
-            self._data.pop(0)       # the first element pushed (oldest)
-        
-        self._data.append(elem)
+        self._data.append(elem)     # a full deque drops the oldest
 
 
     def pop(self):
         '''Removes the last element pushed.'''
         
-        return self._data.pop()
\ No newline at end of file
+        return self._data.pop()
+    
+    
+    def peek(self, count=1):
+        '''Return an iterator over the last elements pushed (at most
+        count, the newest first), without removing or copying them.'''
+        
+        return islice(reversed(self._data), count)
\ No newline at end of file